@@ -9,21 +9,18 @@ from google.genai import types
 
 def calculate(operation: str, a: float, b: float) -> dict[str, Any]:
     """Perform basic arithmetic operations."""
-    operations = {
-        "add": lambda x, y: x + y,
-        "subtract": lambda x, y: x - y,
-        "multiply": lambda x, y: x * y,
-        "divide": lambda x, y: x / y if y != 0 else None,
-    }
-
-    if operation not in operations:
-        return {"error": f"Unknown operation: {operation}"}
-
-    result = operations[operation](a, b)
-    if result is None:
-        return {"error": "Division by zero"}
-
-    return {"result": result}
+    if operation == "add":
+        return {"result": a + b}
+    if operation == "subtract":
+        return {"result": a - b}
+    if operation == "multiply":
+        return {"result": a * b}
+    if operation == "divide":
+        if b == 0:
+            return {"error": "Division by zero"}
+        return {"result": a / b}
+
+    return {"error": f"Unknown operation: {operation}"}
 
 
 calculate_tool = types.Tool(
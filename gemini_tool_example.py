@@ -4,6 +4,7 @@ Simple tool example for use with Google Gemini API.
 This demonstrates how to define and use function calling with Gemini.
 """
 
+import logging
 import os
 import time
 
@@ -13,6 +14,8 @@ from google.genai import errors, types
 
 from calculator_tool import calculate, calculate_tool
 
+logger = logging.getLogger(__name__)
+
 
 def _safe_args(args: object) -> dict[str, object]:
     """Normalize function-call args to a plain dictionary."""
@@ -46,9 +49,11 @@ def _generate_with_retry(
             if not is_transient or attempt == attempts:
                 raise
 
-            print(
-                f"Gemini temporarily unavailable (503). Retrying in {delay_seconds}s "
-                f"({attempt}/{attempts})..."
+            logger.warning(
+                "Gemini temporarily unavailable (503). Retrying in %ds (%d/%d)...",
+                delay_seconds,
+                attempt,
+                attempts,
             )
             time.sleep(delay_seconds)
             delay_seconds *= 2
@@ -59,6 +64,7 @@ def _generate_with_retry(
 def main() -> None:
     """Main function to demonstrate the tool usage with Gemini."""
 
+    logging.basicConfig(level=logging.INFO)
     load_dotenv()
 
     api_key = os.getenv("GEMINI_API_KEY")
@@ -0,0 +1,171 @@
+"""
+Behaviour tests for the Barcelona space compliance checker.
+"""
+
+import json
+from types import SimpleNamespace
+
+import ifcopenshell
+import ifcopenshell.api
+import pytest
+
+from tools import checker_barcelona_compliance as barcelona
+
+
+SPACE_NAMES = [
+    ("Living Room", None, None),
+    ("Habitació 1", None, None),
+    ("X", "Cuina", None),
+    ("X2", None, "Corridor"),
+    ("Kitchen / living", None, None),
+    ("bath hall", None, None),
+    ("Hall", "Bedroom", None),
+    ("Storage", None, None),
+    ("Saló", None, None),
+    (None, None, None),
+]
+
+
+def _space(name, long_name=None, object_type=None):
+    return SimpleNamespace(Name=name, LongName=long_name, ObjectType=object_type)
+
+
+@pytest.mark.skipif(barcelona.ahocorasick is None, reason="pyahocorasick not installed")
+def test_automaton_and_fallback_classify_identically(monkeypatch):
+    """The optional Aho-Corasick path must match the plain keyword loop."""
+    spaces = [_space(*names) for names in SPACE_NAMES]
+    with_automaton = [barcelona._get_space_type_idx(space) for space in spaces]
+
+    monkeypatch.setattr(barcelona, "_KEYWORD_AUTOMATON", None)
+    without_automaton = [barcelona._get_space_type_idx(space) for space in spaces]
+
+    assert with_automaton == without_automaton
+
+
+@pytest.fixture
+def space_model():
+    """IFC model with spaces covering pass, fail, missing values and unknown types."""
+    model = ifcopenshell.file(schema="IFC4")
+    ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcProject", name="Test Project")
+
+    def add_space(name, qto=None, pset=None):
+        space = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcSpace", name=name)
+        if qto:
+            quantities = ifcopenshell.api.run(
+                "pset.add_qto", model, product=space, name="Qto_SpaceBaseQuantities"
+            )
+            ifcopenshell.api.run("pset.edit_qto", model, qto=quantities, properties=qto)
+        if pset:
+            properties = ifcopenshell.api.run("pset.add_pset", model, product=space, name="Custom")
+            ifcopenshell.api.run("pset.edit_pset", model, pset=properties, properties=pset)
+
+    add_space("Living Room", qto={"NetFloorArea": 20.0, "Height": 2.7})
+    add_space("Habitació 1", qto={"NetFloorArea": 8.0, "Height": 2.7})
+    add_space("Menjador", pset={"Area": 30.0})
+    add_space("Storage")
+    return model
+
+
+def _rows_by_name(model):
+    return {row["element_name"]: row for row in barcelona.check_barcelona_space_compliance(model)}
+
+
+def test_passing_space_row(space_model):
+    row = _rows_by_name(space_model)["Living Room"]
+
+    assert row["check_status"] == "pass"
+    assert row["actual_value"] == "space_type=Living Room, area_m2=20.000, height_m=2.700"
+    assert row["required_value"] == "min_area_m2=16.000, min_height_m=2.600"
+    assert row["comment"] == "Meets minimum area and height requirements."
+    assert json.loads(row["log"]) == {
+        "space": "Living Room",
+        "space_type": "Living Room",
+        "measured": {"area_m2": 20.0, "height_m": 2.7},
+        "required": {"min_area_m2": 16.0, "min_height_m": 2.6},
+        "status": "PASS",
+        "reasons": ["Meets minimum area and height requirements."],
+    }
+
+
+def test_failing_space_row(space_model):
+    row = _rows_by_name(space_model)["Habitació 1"]
+
+    assert row["check_status"] == "fail"
+    assert row["actual_value"] == "space_type=Bedroom, area_m2=8.000, height_m=2.700"
+    assert row["required_value"] == "min_area_m2=9.000, min_height_m=2.600"
+    assert row["comment"] == "Area 8.000 m2 < required 9.000 m2."
+    assert json.loads(row["log"])["reasons"] == ["Area 8.000 m2 < required 9.000 m2."]
+
+
+def test_missing_height_row(space_model):
+    row = _rows_by_name(space_model)["Menjador"]
+
+    assert row["check_status"] == "fail"
+    assert row["actual_value"] == "space_type=Living Room, area_m2=30.000, height_m=None"
+    assert row["comment"] == "Height not found."
+    assert json.loads(row["log"])["measured"] == {"area_m2": 30.0, "height_m": None}
+
+
+def test_unknown_type_without_quantities_row(space_model):
+    row = _rows_by_name(space_model)["Storage"]
+
+    assert row["check_status"] == "fail"
+    assert row["actual_value"] == "space_type=unknown, area_m2=None, height_m=None"
+    assert row["required_value"] == "min_area_m2=None, min_height_m=None"
+    assert row["comment"] == "Could not infer space type; Area not found.; Height not found."
+    log = json.loads(row["log"])
+    assert log["space_type"] is None
+    assert log["required"] == {"min_area_m2": None, "min_height_m": None}
+
+
+def test_summary_row(space_model):
+    rows = barcelona.check_barcelona_space_compliance(space_model)
+    summary = rows[-1]
+
+    assert summary["element_type"] == "Summary"
+    assert summary["check_status"] == "fail"
+    assert summary["actual_value"] == "checked=4, passed=1, failed=3, warnings=0, rate=25.00%"
+    assert summary["comment"] == "Computed from provided Barcelona rules"
+    assert json.loads(summary["log"]) == {
+        "total_spaces_input": 4,
+        "total_spaces_checked": 4,
+        "passed_count": 1,
+        "failed_count": 3,
+        "warnings_count": 0,
+        "compliance_rate_percent": 25.0,
+    }
+
+
+def test_result_rows_match_checker_output(space_model):
+    checks = barcelona.compute_space_checks(space_model)
+
+    assert barcelona.to_result_rows(checks) == barcelona.check_barcelona_space_compliance(space_model)
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_space_type_priority_spans_all_attributes(monkeypatch, use_automaton):
+    """SPACE_KEYWORDS order decides across Name/LongName/ObjectType, not attribute order."""
+    if use_automaton and barcelona.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    if not use_automaton:
+        monkeypatch.setattr(barcelona, "_KEYWORD_AUTOMATON", None)
+
+    type_idx = barcelona._get_space_type_idx(_space("Hall", "Bedroom"))
+
+    assert barcelona._SPACE_TYPES[type_idx] == "Bedroom"
+
+
+def test_hall_named_bedroom_is_checked_against_bedroom_rule():
+    model = ifcopenshell.file(schema="IFC4")
+    space = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcSpace", name="Hall")
+    space.LongName = "Bedroom"
+    quantities = ifcopenshell.api.run("pset.add_qto", model, product=space, name="Qto_SpaceBaseQuantities")
+    ifcopenshell.api.run(
+        "pset.edit_qto", model, qto=quantities, properties={"NetFloorArea": 5.0, "Height": 2.7}
+    )
+
+    row = barcelona.check_barcelona_space_compliance(model)[0]
+
+    assert row["check_status"] == "fail"
+    assert row["required_value"] == "min_area_m2=9.000, min_height_m=2.600"
+    assert row["comment"] == "Area 5.000 m2 < required 9.000 m2."
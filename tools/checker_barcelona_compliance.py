@@ -4,10 +4,19 @@ from __future__ import annotations
 
 import json
 import unicodedata
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 import ifcopenshell
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional accelerator (pyahocorasick)
+    ahocorasick = None
+
 
 SPACE_RULES = {
     "Living Room": {"min_height": 2.6, "min_area": 16.0},
@@ -25,21 +34,85 @@ SPACE_KEYWORDS = {
     "Corridor": ["corridor", "hall", "pasillo", "passage", "rebedor", "distrib"],
 }
 
-QTO_AREA_NAMES = {"netfloorarea", "grossfloorarea", "floorarea"}
-QTO_HEIGHT_NAMES = {"height", "clearheight", "netheight"}
+QTO_AREA_NAMES = frozenset({"netfloorarea", "grossfloorarea", "floorarea"})
+QTO_HEIGHT_NAMES = frozenset({"height", "clearheight", "netheight"})
+
+# Shared encoder for the per-row ``log`` payloads; json.dumps with custom
+# options would build a new JSONEncoder on every call.
+_LOG_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+# Lowercase Catalan/Spanish diacritics folded to their base letters, matching
+# what NFKD + dropping combining marks produces for them.
+_DIACRITIC_FOLD = str.maketrans("áàâäãéèêëíìîïóòôöõúùûüçñ", "aaaaaeeeeiiiiooooouuuucn")
 
 
 def _norm_text(value: object) -> str:
     """Normalize text for robust matching."""
     if value is None:
         return ""
+    return _norm_text_cached(str(value))
+
+
+@lru_cache(maxsize=2048)
+def _norm_text_cached(text: str) -> str:
+    """Cached body of _norm_text; IFC models repeat many names (e.g. "Bedroom")."""
+    text = text.strip().lower()
+    if text.isascii():
+        return text
+
+    text = text.translate(_DIACRITIC_FOLD)
+    if text.isascii():
+        return text
 
-    text = str(value).strip().lower()
+    # Slow path for anything outside the folding table.
     text = unicodedata.normalize("NFKD", text)
     text = "".join(ch for ch in text if not unicodedata.combining(ch))
     return text
 
 
+def _norm_ascii(value: str | None) -> str:
+    """Lowercase schema-defined names (e.g. quantity names) without Unicode folding."""
+    if not value:
+        return ""
+    return value.strip().lower()
+
+
+# Space types are addressed by their SPACE_KEYWORDS position, which is also
+# their classification priority. Keywords are normalized once so
+# classification only normalizes the space names.
+_SPACE_TYPES = tuple(SPACE_KEYWORDS)
+_SPACE_KEYWORDS_NORM = tuple(
+    tuple(_norm_text(keyword) for keyword in keywords) for keywords in SPACE_KEYWORDS.values()
+)
+# (min_height, min_area) per space type index; None when no rule is defined.
+_RULES = tuple(
+    (SPACE_RULES[space_type]["min_height"], SPACE_RULES[space_type]["min_area"])
+    if space_type in SPACE_RULES
+    else None
+    for space_type in _SPACE_TYPES
+)
+
+
+def _build_keyword_automaton():
+    """Compile all space keywords into one Aho-Corasick automaton, if available."""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for type_idx, keywords in enumerate(_SPACE_KEYWORDS_NORM):
+        for keyword in keywords:
+            # Values are priority indexes; keep the first space type on duplicates.
+            if keyword not in automaton:
+                automaton.add_word(keyword, type_idx)
+
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
 def _to_float(value: object) -> float | None:
     """Best-effort conversion to float."""
     if value is None:
@@ -60,105 +133,172 @@ def _to_float(value: object) -> float | None:
     return None
 
 
-def _get_space_type(space: ifcopenshell.entity_instance) -> str | None:
-    """Classify a space type from Name/LongName/ObjectType keywords."""
-    haystack = " ".join(
-        [
-            _norm_text(getattr(space, "Name", None)),
-            _norm_text(getattr(space, "LongName", None)),
-            _norm_text(getattr(space, "ObjectType", None)),
-        ]
-    )
+def _match_space_type_idx(text: str) -> int | None:
+    """Return the lowest space type index with a keyword in the normalized text."""
+    if _KEYWORD_AUTOMATON is not None:
+        # Keep SPACE_KEYWORDS order as priority, not position in the text.
+        return min((idx for _, idx in _KEYWORD_AUTOMATON.iter(text)), default=None)
 
-    for space_type, keywords in SPACE_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in haystack:
-                return space_type
+    for type_idx, keywords in enumerate(_SPACE_KEYWORDS_NORM):
+        if any(keyword in text for keyword in keywords):
+            return type_idx
 
     return None
 
 
-def _iter_property_defs(space: ifcopenshell.entity_instance):
-    """Yield property definitions linked to a space via IfcRelDefinesByProperties."""
-    for rel in getattr(space, "IsDefinedBy", []) or []:
-        if not rel or not rel.is_a("IfcRelDefinesByProperties"):
-            continue
-
-        prop_def = getattr(rel, "RelatingPropertyDefinition", None)
-        if prop_def:
-            yield prop_def
-
-
-def _extract_area_m2(space: ifcopenshell.entity_instance) -> float | None:
-    """Extract area using required precedence logic."""
-    # 1) Quantity takeoff preferred names
-    for prop_def in _iter_property_defs(space):
-        if not prop_def.is_a("IfcElementQuantity"):
-            continue
-
-        for q in getattr(prop_def, "Quantities", []) or []:
-            if not q or not q.is_a("IfcQuantityArea"):
-                continue
-
-            qname = _norm_text(getattr(q, "Name", None))
-            if qname in QTO_AREA_NAMES:
-                return _to_float(getattr(q, "AreaValue", None))
-
-    # 2) Property set fallback: any property with "area" in name
-    for prop_def in _iter_property_defs(space):
-        if not prop_def.is_a("IfcPropertySet"):
+def _get_space_type_idx(space: ifcopenshell.entity_instance) -> int | None:
+    """Classify a space type index from Name/LongName/ObjectType keywords."""
+    # The lowest index across all three attributes wins; keywords contain no
+    # spaces, so this matches searching the attributes joined together.
+    best_idx: int | None = None
+    for attr in ("Name", "LongName", "ObjectType"):
+        text = _norm_text(getattr(space, attr, None))
+        if not text:
             continue
 
-        for prop in getattr(prop_def, "HasProperties", []) or []:
-            pname = _norm_text(getattr(prop, "Name", None))
-            if "area" not in pname:
-                continue
+        type_idx = _match_space_type_idx(text)
+        if type_idx is not None and (best_idx is None or type_idx < best_idx):
+            best_idx = type_idx
+            if best_idx == 0:
+                break
 
-            nominal = getattr(prop, "NominalValue", None)
-            val = _to_float(nominal)
-            if val is not None:
-                return val
-
-    return None
+    return best_idx
 
 
-def _extract_height_m(space: ifcopenshell.entity_instance) -> float | None:
-    """Extract height using required precedence logic."""
-    # 1) Quantity takeoff preferred names
-    for prop_def in _iter_property_defs(space):
-        if not prop_def.is_a("IfcElementQuantity"):
+def _index_property_defs(model: ifcopenshell.file) -> dict[int, list[ifcopenshell.entity_instance]]:
+    """Map object ids to property definitions linked via IfcRelDefinesByProperties."""
+    index: dict[int, list[ifcopenshell.entity_instance]] = defaultdict(list)
+    for rel in model.by_type("IfcRelDefinesByProperties"):
+        prop_def = rel.RelatingPropertyDefinition
+        if not prop_def:
             continue
 
-        for q in getattr(prop_def, "Quantities", []) or []:
-            if not q or not q.is_a("IfcQuantityLength"):
-                continue
+        for obj in rel.RelatedObjects or ():
+            index[obj.id()].append(prop_def)
+
+    return index
+
+
+def _extract_area_and_height(
+    prop_defs: Sequence[ifcopenshell.entity_instance],
+) -> tuple[float | None, float | None]:
+    """Extract area and height in one pass using required precedence logic."""
+    # 1) Quantity takeoff preferred names win over
+    # 2) property set fallback: any property with "area"/"height" in name
+    qto_area: float | None = None
+    qto_height: float | None = None
+    has_qto_area = False
+    has_qto_height = False
+    pset_area: float | None = None
+    pset_height: float | None = None
+
+    # None of the matched classes have subtypes, so comparing the declared
+    # type name once per instance is equivalent to is_a(<name>) checks.
+    for prop_def in prop_defs:
+        prop_def_type = prop_def.is_a()
+        if prop_def_type == "IfcElementQuantity":
+            for q in prop_def.Quantities or ():
+                if not q:
+                    continue
+
+                q_type = q.is_a()
+                if q_type == "IfcQuantityArea":
+                    if not has_qto_area and _norm_ascii(q.Name) in QTO_AREA_NAMES:
+                        qto_area = _to_float(getattr(q, "AreaValue", None))
+                        has_qto_area = True
+                elif q_type == "IfcQuantityLength":
+                    if not has_qto_height and _norm_ascii(q.Name) in QTO_HEIGHT_NAMES:
+                        qto_height = _to_float(getattr(q, "LengthValue", None))
+                        has_qto_height = True
+
+        elif prop_def_type == "IfcPropertySet":
+            for prop in prop_def.HasProperties or ():
+                pname = _norm_text(getattr(prop, "Name", None))
+                if pset_area is None and "area" in pname:
+                    pset_area = _to_float(getattr(prop, "NominalValue", None))
+                if pset_height is None and "height" in pname:
+                    pset_height = _to_float(getattr(prop, "NominalValue", None))
+
+    area = qto_area if has_qto_area else pset_area
+    height = qto_height if has_qto_height else pset_height
+    return area, height
 
-            qname = _norm_text(getattr(q, "Name", None))
-            if qname in QTO_HEIGHT_NAMES:
-                return _to_float(getattr(q, "LengthValue", None))
 
-    # 2) Property set fallback: any property with "height" in name
-    for prop_def in _iter_property_defs(space):
-        if not prop_def.is_a("IfcPropertySet"):
-            continue
+def _format_decimal(value: float | None, digits: int = 3) -> str:
+    if value is None:
+        return "None"
+    return f"{value:.{digits}f}"
 
-        for prop in getattr(prop_def, "HasProperties", []) or []:
-            pname = _norm_text(getattr(prop, "Name", None))
-            if "height" not in pname:
-                continue
 
-            nominal = getattr(prop, "NominalValue", None)
-            val = _to_float(nominal)
-            if val is not None:
-                return val
+REASON_NO_TYPE = 1
+REASON_NO_RULE = 2
+REASON_NO_AREA = 4
+REASON_AREA_LOW = 8
+REASON_NO_HEIGHT = 16
+REASON_HEIGHT_LOW = 32
+
+
+@dataclass(slots=True)
+class SpaceCheck:
+    """Raw outcome of one IfcSpace check; strings are only built on demand."""
+
+    element_id: str | None
+    name: str
+    long_name: str | None
+    type_idx: int | None
+    area: float | None
+    height: float | None
+    required_area: float | None
+    required_height: float | None
+    reason_bits: int = 0
+
+    @property
+    def space_type(self) -> str | None:
+        return _SPACE_TYPES[self.type_idx] if self.type_idx is not None else None
+
+    @property
+    def passed(self) -> bool:
+        return self.reason_bits == 0
+
+    @property
+    def status(self) -> str:
+        return "pass" if self.passed else "fail"
+
+    def actual_value(self) -> str:
+        """Contract ``actual_value`` string, formatted from the raw measurements on demand."""
+        return (
+            f"space_type={self.space_type or 'unknown'}, "
+            f"area_m2={_format_decimal(self.area)}, "
+            f"height_m={_format_decimal(self.height)}"
+        )
 
-    return None
+    def required_value(self) -> str:
+        """Contract ``required_value`` string, formatted from the rule minimums on demand."""
+        return (
+            f"min_area_m2={_format_decimal(self.required_area)}, "
+            f"min_height_m={_format_decimal(self.required_height)}"
+        )
 
+    def reasons(self) -> list[str]:
+        """Human-readable reasons in the order the checks are applied."""
+        bits = self.reason_bits
+        if not bits:
+            return ["Meets minimum area and height requirements."]
 
-def _format_decimal(value: float | None, digits: int = 3) -> str:
-    if value is None:
-        return "None"
-    return f"{value:.{digits}f}"
+        reasons: list[str] = []
+        if bits & REASON_NO_TYPE:
+            reasons.append("Could not infer space type")
+        if bits & REASON_NO_RULE:
+            reasons.append(f"Unrecognized space type: {self.space_type}")
+        if bits & REASON_NO_AREA:
+            reasons.append("Area not found.")
+        if bits & REASON_AREA_LOW:
+            reasons.append(f"Area {self.area:.3f} m2 < required {self.required_area:.3f} m2.")
+        if bits & REASON_NO_HEIGHT:
+            reasons.append("Height not found.")
+        if bits & REASON_HEIGHT_LOW:
+            reasons.append(f"Height {self.height:.3f} m < required {self.required_height:.3f} m.")
+        return reasons
 
 
 def _result(
@@ -186,96 +326,80 @@ def _result(
     }
 
 
-def check_barcelona_space_compliance(model: ifcopenshell.file, **kwargs) -> list[dict[str, Any]]:
-    """Check IfcSpace minimum area/height compliance using provided Catalan rules."""
-    del kwargs
-
+def compute_space_checks(model: ifcopenshell.file) -> list[SpaceCheck]:
+    """Classify and measure every IfcSpace without building any display strings."""
     spaces = model.by_type("IfcSpace")
-    results: list[dict[str, Any]] = []
-
-    passed = 0
-    failed = 0
-    warnings = 0
+    prop_defs_by_id = _index_property_defs(model)
 
+    checks: list[SpaceCheck] = []
     for space in spaces:
         name = getattr(space, "Name", None) or f"IfcSpace #{space.id()}"
         long_name = getattr(space, "LongName", None)
-        space_type = _get_space_type(space)
-
-        area = _extract_area_m2(space)
-        height = _extract_height_m(space)
+        type_idx = _get_space_type_idx(space)
+        area, height = _extract_area_and_height(prop_defs_by_id.get(space.id(), ()))
 
-        reasons: list[str] = []
+        reason_bits = 0
         required_area: float | None = None
         required_height: float | None = None
 
-        if not space_type:
-            reasons.append("Could not infer space type")
+        if type_idx is None:
+            reason_bits |= REASON_NO_TYPE
         else:
-            rule = SPACE_RULES.get(space_type)
-            if not rule:
-                reasons.append(f"Unrecognized space type: {space_type}")
+            rule = _RULES[type_idx]
+            if rule is None:
+                reason_bits |= REASON_NO_RULE
             else:
-                required_area = rule["min_area"]
-                required_height = rule["min_height"]
+                required_height, required_area = rule
 
         if area is None:
-            reasons.append("Area not found.")
+            reason_bits |= REASON_NO_AREA
         elif required_area is not None and area < required_area:
-            reasons.append(f"Area {area:.3f} m2 < required {required_area:.3f} m2.")
+            reason_bits |= REASON_AREA_LOW
 
         if height is None:
-            reasons.append("Height not found.")
+            reason_bits |= REASON_NO_HEIGHT
         elif required_height is not None and height < required_height:
-            reasons.append(f"Height {height:.3f} m < required {required_height:.3f} m.")
-
-        is_pass = len(reasons) == 0
-        status = "pass" if is_pass else "fail"
-
-        if is_pass:
-            passed += 1
-            reasons = ["Meets minimum area and height requirements."]
-        else:
-            failed += 1
-
-        structured_output = {
-            "space": str(name),
-            "space_type": space_type,
-            "measured": {
-                "area_m2": area,
-                "height_m": height,
-            },
-            "required": {
-                "min_area_m2": required_area,
-                "min_height_m": required_height,
-            },
-            "status": "PASS" if is_pass else "FAIL",
-            "reasons": reasons,
-        }
+            reason_bits |= REASON_HEIGHT_LOW
 
-        results.append(
-            _result(
+        checks.append(
+            SpaceCheck(
                 element_id=getattr(space, "GlobalId", None),
-                element_type="IfcSpace",
-                element_name=str(name),
-                element_name_long=str(long_name) if long_name else None,
-                check_status=status,
-                actual_value=(
-                    f"space_type={space_type or 'unknown'}, "
-                    f"area_m2={_format_decimal(area)}, "
-                    f"height_m={_format_decimal(height)}"
-                ),
-                required_value=(
-                    f"min_area_m2={_format_decimal(required_area)}, "
-                    f"min_height_m={_format_decimal(required_height)}"
-                ),
-                comment="; ".join(reasons),
-                log=json.dumps(structured_output, ensure_ascii=True),
+                name=str(name),
+                long_name=str(long_name) if long_name else None,
+                type_idx=type_idx,
+                area=area,
+                height=height,
+                required_area=required_area,
+                required_height=required_height,
+                reason_bits=reason_bits,
             )
         )
 
-    total_input = len(spaces)
+    return checks
+
+
+SUMMARY_NAME = "Barcelona Space Compliance Summary"
+
+
+def summary_text(checked: int, passed: int, warnings: int = 0) -> tuple[str, str]:
+    """Summary ``actual_value`` and ``comment`` strings from plain counts."""
+    failed = checked - passed
+    compliance_rate = (passed / checked * 100.0) if checked > 0 else 0.0
+    actual_value = (
+        f"checked={checked}, passed={passed}, failed={failed}, "
+        f"warnings={warnings}, rate={compliance_rate:.2f}%"
+    )
+    comment = "No IfcSpace elements found" if checked == 0 else "Computed from provided Barcelona rules"
+    return actual_value, comment
+
+
+def summary_result(checks: Sequence[SpaceCheck]) -> dict[str, Any]:
+    """Build the compliance summary row for a list of space checks."""
+    total_input = len(checks)
     total_checked = total_input
+    passed = sum(1 for check in checks if check.passed)
+    failed = total_checked - passed
+    warnings = 0
     compliance_rate = (passed / total_checked * 100.0) if total_checked > 0 else 0.0
 
     summary = {
@@ -286,24 +410,62 @@ def check_barcelona_space_compliance(model: ifcopenshell.file, **kwargs) -> list
         "warnings_count": warnings,
         "compliance_rate_percent": round(compliance_rate, 2),
     }
+    actual_value, comment = summary_text(total_checked, passed, warnings)
+
+    return _result(
+        element_id=None,
+        element_type="Summary",
+        element_name=SUMMARY_NAME,
+        element_name_long=None,
+        check_status="pass" if failed == 0 else "fail",
+        actual_value=actual_value,
+        required_value="All checked spaces should meet minimum area and height by inferred space type",
+        comment=comment,
+        log=_LOG_ENCODER.encode(summary),
+    )
 
-    results.append(
-        _result(
-            element_id=None,
-            element_type="Summary",
-            element_name="Barcelona Space Compliance Summary",
-            element_name_long=None,
-            check_status="pass" if failed == 0 else "fail",
-            actual_value=(
-                f"checked={total_checked}, passed={passed}, failed={failed}, "
-                f"warnings={warnings}, rate={compliance_rate:.2f}%"
-            ),
-            required_value="All checked spaces should meet minimum area and height by inferred space type",
-            comment=(
-                "No IfcSpace elements found" if total_checked == 0 else "Computed from provided Barcelona rules"
-            ),
-            log=json.dumps(summary, ensure_ascii=True),
+
+def to_result_rows(checks: Sequence[SpaceCheck]) -> list[dict[str, Any]]:
+    """Format space checks into checker-contract rows, followed by the summary row."""
+    results: list[dict[str, Any]] = []
+
+    for check in checks:
+        reasons = check.reasons()
+
+        structured_output = {
+            "space": check.name,
+            "space_type": check.space_type,
+            "measured": {
+                "area_m2": check.area,
+                "height_m": check.height,
+            },
+            "required": {
+                "min_area_m2": check.required_area,
+                "min_height_m": check.required_height,
+            },
+            "status": "PASS" if check.passed else "FAIL",
+            "reasons": reasons,
+        }
+
+        results.append(
+            _result(
+                element_id=check.element_id,
+                element_type="IfcSpace",
+                element_name=check.name,
+                element_name_long=check.long_name,
+                check_status=check.status,
+                actual_value=check.actual_value(),
+                required_value=check.required_value(),
+                comment="; ".join(reasons),
+                log=_LOG_ENCODER.encode(structured_output),
+            )
         )
-    )
 
+    results.append(summary_result(checks))
     return results
+
+
+def check_barcelona_space_compliance(model: ifcopenshell.file, **kwargs) -> list[dict[str, Any]]:
+    """Check IfcSpace minimum area/height compliance using provided Catalan rules."""
+    del kwargs
+    return to_result_rows(compute_space_checks(model))
@@ -2,15 +2,25 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from pathlib import Path
 
 import ifcopenshell
 try:
-    from checker_barcelona_compliance import check_barcelona_space_compliance
+    from checker_barcelona_compliance import (
+        SUMMARY_NAME,
+        SpaceCheck,
+        compute_space_checks,
+        summary_text,
+    )
 except ImportError:
-    from tools.checker_barcelona_compliance import check_barcelona_space_compliance
+    from tools.checker_barcelona_compliance import (
+        SUMMARY_NAME,
+        SpaceCheck,
+        compute_space_checks,
+        summary_text,
+    )
 
 
 DEFAULT_ENTITY_TYPES = [
@@ -193,8 +203,8 @@ def check_ifc_parse(
     return results
 
 
-def _build_parse_section(results: list[dict]) -> list[str]:
-    """Build the IFC parse section lines."""
+def _build_parse_section(results: list[dict]) -> Iterator[str]:
+    """Yield the IFC parse section lines."""
 
     def _clip(value: object, width: int) -> str:
         text = _to_text(value)
@@ -202,32 +212,38 @@ def _build_parse_section(results: list[dict]) -> list[str]:
             return text
         return text[: width - 3] + "..."
 
-    summary_rows = [row for row in results if row.get("element_type") == "Summary"]
-    detail_rows = [row for row in results if row.get("element_type") != "Summary"]
-
+    noteworthy_statuses = {"warning", "fail", "blocked"}
+    summary_count = 0
+    detail_rows: list[dict] = []
+    noteworthy: list[dict] = []
+    entity_count_rows: list[tuple[str, str, str]] = []
     status_counts: dict[str, int] = {}
+
     for row in results:
         status = _to_text(row.get("check_status")).lower() or "unknown"
         status_counts[status] = status_counts.get(status, 0) + 1
+        if status in noteworthy_statuses:
+            noteworthy.append(row)
 
-    entity_count_rows: list[tuple[str, str, str]] = []
-    for row in summary_rows:
-        name = _to_text(row.get("element_name"))
-        if not name.endswith(" Count"):
+        if row.get("element_type") != "Summary":
+            detail_rows.append(row)
             continue
-        entity_type = name[: -len(" Count")]
-        entity_count_rows.append(
-            (
-                entity_type,
-                _to_text(row.get("actual_value")),
-                _to_text(row.get("check_status")).upper(),
+
+        summary_count += 1
+        name = _to_text(row.get("element_name"))
+        if name.endswith(" Count"):
+            entity_count_rows.append(
+                (
+                    name[: -len(" Count")],
+                    _to_text(row.get("actual_value")),
+                    _to_text(row.get("check_status")).upper(),
+                )
             )
-        )
 
-    lines = [
+    yield from [
         "A) IFC PARSE SUMMARY",
         "-" * 100,
-        f"Total parse rows: {len(results)} (summary={len(summary_rows)}, details={len(detail_rows)})",
+        f"Total parse rows: {len(results)} (summary={summary_count}, details={len(detail_rows)})",
         "",
         "1) STATUS DISTRIBUTION",
         "-" * 100,
@@ -238,71 +254,61 @@ def _build_parse_section(results: list[dict]) -> list[str]:
     for status in ["pass", "warning", "fail", "blocked", "log", "unknown"]:
         count = status_counts.get(status)
         if count is not None:
-            lines.append(f"{status.upper():<12} {count:>8}")
-
-    lines.extend(
-        [
-            "",
-            "2) ENTITY COUNTS",
-            "-" * 100,
-            f"{'Entity Type':<30} {'Count':>8} {'Status':>12}",
-            "-" * 100,
-        ]
-    )
+            yield f"{status.upper():<12} {count:>8}"
+
+    yield from [
+        "",
+        "2) ENTITY COUNTS",
+        "-" * 100,
+        f"{'Entity Type':<30} {'Count':>8} {'Status':>12}",
+        "-" * 100,
+    ]
 
     if entity_count_rows:
         for entity_type, count, status in entity_count_rows:
-            lines.append(f"{_clip(entity_type, 30):<30} {count:>8} {status:>12}")
+            yield f"{_clip(entity_type, 30):<30} {count:>8} {status:>12}"
     else:
-        lines.append("No entity count rows were generated.")
-
-    lines.extend(
-        [
-            "",
-            "3) SAMPLED ELEMENTS",
-            "-" * 100,
-            f"{'#':>3} {'Type':<18} {'Name':<34} {'GlobalId':<24} {'Note':<17}",
-            "-" * 100,
-        ]
-    )
+        yield "No entity count rows were generated."
+
+    yield from [
+        "",
+        "3) SAMPLED ELEMENTS",
+        "-" * 100,
+        f"{'#':>3} {'Type':<18} {'Name':<34} {'GlobalId':<24} {'Note':<17}",
+        "-" * 100,
+    ]
 
     if detail_rows:
         for idx, row in enumerate(detail_rows, start=1):
-            lines.append(
-                f"{idx:>3} "
-                f"{_clip(row.get('element_type'), 18):<18} "
-                f"{_clip(row.get('element_name'), 34):<34} "
-                f"{_clip(row.get('element_id') or '-', 24):<24} "
-                f"{_clip(row.get('check_status'), 17):<17}"
-            )
+            etype = _clip(row.get("element_type"), 18)
+            ename = _clip(row.get("element_name"), 34)
+            eid = _clip(row.get("element_id") or "-", 24)
+            status = _clip(row.get("check_status"), 17)
+            yield f"{idx:>3} {etype:<18} {ename:<34} {eid:<24} {status:<17}"
     else:
-        lines.append("No element-level sample rows found.")
+        yield "No element-level sample rows found."
 
-    noteworthy = [
-        row
-        for row in results
-        if _to_text(row.get("check_status")).lower() in {"warning", "fail", "blocked"}
-    ]
-    lines.extend(["", "4) PARSE WARNINGS / FAILURES / BLOCKED", "-" * 100])
+    yield from ["", "4) PARSE WARNINGS / FAILURES / BLOCKED", "-" * 100]
     if noteworthy:
         for row in noteworthy:
-            lines.append(
-                f"- [{_to_text(row.get('check_status')).upper()}] "
-                f"{_to_text(row.get('element_type'))} | {_to_text(row.get('element_name'))}"
-            )
-            if row.get("comment"):
-                lines.append(f"  comment: {_to_text(row.get('comment'))}")
-            if row.get("log"):
-                lines.append(f"  log    : {_to_text(row.get('log'))}")
+            status = _to_text(row.get("check_status")).upper()
+            etype = _to_text(row.get("element_type"))
+            ename = _to_text(row.get("element_name"))
+            comment = row.get("comment")
+            log = row.get("log")
+            yield f"- [{status}] {etype} | {ename}"
+            if comment:
+                yield f"  comment: {_to_text(comment)}"
+            if log:
+                yield f"  log    : {_to_text(log)}"
     else:
-        lines.append("No warnings, failures, or blocked items.")
+        yield "No warnings, failures, or blocked items."
 
-    lines.append("")
-    return lines
+    yield ""
 
 
-def _build_compliance_section(results: list[dict]) -> list[str]:
-    """Build the Barcelona compliance section lines."""
+def _build_compliance_section(checks: list[SpaceCheck]) -> Iterator[str]:
+    """Yield the Barcelona compliance section lines."""
 
     def _clip(value: object, width: int) -> str:
         text = _to_text(value)
@@ -310,22 +316,18 @@ def _build_compliance_section(results: list[dict]) -> list[str]:
             return text
         return text[: width - 3] + "..."
 
-    summary_rows = [
-        row for row in results if row.get("element_type") == "Summary"
-    ]
-    space_rows = [
-        row for row in results if row.get("element_type") == "IfcSpace"
-    ]
-
+    failed: list[SpaceCheck] = []
     status_counts: dict[str, int] = {}
-    for row in space_rows:
-        status = _to_text(row.get("check_status")).lower() or "unknown"
+    for check in checks:
+        status = check.status
         status_counts[status] = status_counts.get(status, 0) + 1
+        if not check.passed:
+            failed.append(check)
 
-    lines = [
+    yield from [
         "B) BARCELONA SPACE COMPLIANCE",
         "-" * 100,
-        f"Total space checks: {len(space_rows)}",
+        f"Total space checks: {len(checks)}",
         "",
         "1) COMPLIANCE STATUS COUNTS",
         "-" * 100,
@@ -335,67 +337,52 @@ def _build_compliance_section(results: list[dict]) -> list[str]:
     for status in ["pass", "fail", "warning", "blocked", "log", "unknown"]:
         count = status_counts.get(status)
         if count is not None:
-            lines.append(f"{status.upper():<12} {count:>8}")
-
-    lines.extend(
-        [
-            "",
-            "2) SPACE-BY-SPACE RESULTS",
-            "-" * 100,
-            f"{'#':>3} {'Space':<26} {'Status':<8} {'Measured':<34} {'Required':<26}",
-            "-" * 100,
-        ]
-    )
+            yield f"{status.upper():<12} {count:>8}"
 
-    if space_rows:
-        for idx, row in enumerate(space_rows, start=1):
-            lines.append(
+    yield from [
+        "",
+        "2) SPACE-BY-SPACE RESULTS",
+        "-" * 100,
+        f"{'#':>3} {'Space':<26} {'Status':<8} {'Measured':<34} {'Required':<26}",
+        "-" * 100,
+    ]
+
+    if checks:
+        for idx, check in enumerate(checks, start=1):
+            yield (
                 f"{idx:>3} "
-                f"{_clip(row.get('element_name'), 26):<26} "
-                f"{_clip(_to_text(row.get('check_status')).upper(), 8):<8} "
-                f"{_clip(row.get('actual_value'), 34):<34} "
-                f"{_clip(row.get('required_value'), 26):<26}"
+                f"{_clip(check.name, 26):<26} "
+                f"{_clip(check.status.upper(), 8):<8} "
+                f"{_clip(check.actual_value(), 34):<34} "
+                f"{_clip(check.required_value(), 26):<26}"
             )
     else:
-        lines.append("No IfcSpace rows found.")
+        yield "No IfcSpace rows found."
 
-    failed_or_warn = [
-        row
-        for row in space_rows
-        if _to_text(row.get("check_status")).lower() in {"fail", "warning", "blocked"}
-    ]
-    lines.extend(["", "3) NON-COMPLIANT DETAILS", "-" * 100])
-    if failed_or_warn:
-        for row in failed_or_warn:
-            lines.append(
-                f"- [{_to_text(row.get('check_status')).upper()}] {_to_text(row.get('element_name'))}"
-            )
-            if row.get("comment"):
-                lines.append(f"  reasons: {_to_text(row.get('comment'))}")
-    else:
-        lines.append("All checked spaces are compliant.")
-
-    lines.extend(["", "4) COMPLIANCE SUMMARY ROWS", "-" * 100])
-    if summary_rows:
-        for row in summary_rows:
-            lines.append(f"- {_to_text(row.get('element_name'))}: {_to_text(row.get('actual_value'))}")
-            if row.get("comment"):
-                lines.append(f"  comment: {_to_text(row.get('comment'))}")
+    yield from ["", "3) NON-COMPLIANT DETAILS", "-" * 100]
+    if failed:
+        for check in failed:
+            yield f"- [{check.status.upper()}] {check.name}"
+            yield f"  reasons: {'; '.join(check.reasons())}"
     else:
-        lines.append("No summary rows produced.")
+        yield "All checked spaces are compliant."
+
+    yield from ["", "4) COMPLIANCE SUMMARY ROWS", "-" * 100]
+    summary_value, summary_comment = summary_text(len(checks), len(checks) - len(failed))
+    yield f"- {SUMMARY_NAME}: {summary_value}"
+    yield f"  comment: {summary_comment}"
 
-    lines.append("")
-    return lines
+    yield ""
 
 
 def _build_complete_report(
     ifc_path: str,
     parse_results: list[dict],
-    compliance_results: list[dict],
-) -> str:
-    """Build full report content with parse and compliance sections."""
+    space_checks: list[SpaceCheck],
+) -> Iterator[str]:
+    """Yield full report lines with parse and compliance sections."""
     divider = "=" * 100
-    lines = [
+    yield from [
         divider,
         "IFC COMPLETE REPORT (PARSE + BARCELONA COMPLIANCE)",
         divider,
@@ -404,10 +391,9 @@ def _build_complete_report(
         "",
     ]
 
-    lines.extend(_build_parse_section(parse_results))
-    lines.extend(_build_compliance_section(compliance_results))
-    lines.append(divider)
-    return "\n".join(lines) + "\n"
+    yield from _build_parse_section(parse_results)
+    yield from _build_compliance_section(space_checks)
+    yield divider
 
 
 def main() -> None:
@@ -419,20 +405,21 @@ def main() -> None:
 
     model = ifcopenshell.open(str(ifc_file))
     parse_results = check_ifc_parse(model)
-    compliance_results = check_barcelona_space_compliance(model)
+    space_checks = compute_space_checks(model)
 
     reports_dir = Path(__file__).resolve().parent / "reports"
     reports_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = reports_dir / f"ifc_complete_report_{timestamp}.txt"
-    report_path.write_text(
-        _build_complete_report(DEFAULT_IFC_PATH, parse_results, compliance_results),
-        encoding="utf-8",
-    )
+    with report_path.open("w", encoding="utf-8", buffering=1 << 16) as report_file:
+        report_file.writelines(
+            f"{line}\n"
+            for line in _build_complete_report(DEFAULT_IFC_PATH, parse_results, space_checks)
+        )
 
     print(f"Report generated: {report_path}")
     print(f"Parse rows written: {len(parse_results)}")
-    print(f"Compliance rows written: {len(compliance_results)}")
+    print(f"Compliance spaces checked: {len(space_checks)}")
 
 
 if __name__ == "__main__":